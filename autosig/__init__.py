@@ -1,8 +1,28 @@
 # -*- coding: utf-8 -*-
 """Top-level package for autosig."""
-from .autosig import Signature, autosig, param, Retval
+from .autosig import (
+    Signature,
+    autosig,
+    param,
+    Retval,
+    Overload,
+    set_trust,
+    noop_for,
+    all_of,
+    any_of,
+)
 
-__all__ = ["Signature", "autosig", "param", "Retval"]
+__all__ = [
+    "Signature",
+    "autosig",
+    "param",
+    "Retval",
+    "Overload",
+    "set_trust",
+    "noop_for",
+    "all_of",
+    "any_of",
+]
 __author__ = """Antonio Piccolboni"""
 __email__ = "autosig@piccolboni.info"
 __version__ = "__version__ = '0.10.0'"
@@ -1,23 +1,93 @@
 """Implementation of autosig."""
-from attr import attrib, NOTHING, fields_dict, make_class
-from collections import OrderedDict
-from functools import wraps
+try:
+    from contextvars import ContextVar
+except ImportError:  # python < 3.7, trust is not available
+    ContextVar = None
+from attr import asdict, attrib, Factory, NOTHING, fields_dict, make_class
+from collections import OrderedDict, deque, namedtuple
+from functools import partial, wraps
 from inspect import getsource, signature
-from itertools import chain
+from io import StringIO
+from itertools import chain, count
+from operator import attrgetter
+import json
+from multiprocessing import get_context
 import re
+from time import perf_counter
+from tokenize import COMMENT, ENDMARKER, NEWLINE, OP, TokenError, generate_tokens
 from toolz.functoolz import curry
+from toolz.itertoolz import partition_all
 from types import BuiltinFunctionType
 
-__all__ = ["Signature", "autosig", "param", "Retval"]
+__all__ = [
+    "Signature",
+    "autosig",
+    "param",
+    "Retval",
+    "Overload",
+    "set_trust",
+    "noop_for",
+    "all_of",
+    "any_of",
+]
 
 AUTOSIG_DOCSTRING = "__autosig_docstring__"
 AUTOSIG_POSITION = "__autosig_position__"
+AUTOSIG_TYPE = "__autosig_type__"
+AUTOSIG_BIND = "__autosig_bind__"
+AUTOSIG_CALL = "__autosig_call__"
+AUTOSIG_REFERENCE = "__autosig_reference__"
+AUTOSIG_TRUST = "__autosig_trust__"
+AUTOSIG_NOOP_FOR = "__autosig_noop_for__"
+AUTOSIG_STRATEGY = "__autosig_strategy__"
+
+HYPOTHESIS_MISSING = (
+    "Generating arguments requires hypothesis, "
+    "install it with: pip install autosig[testing]"
+)
+
+# number of distinct argument type combinations each decorated function
+# builds a specialized call path for
+INLINE_CACHE_SIZE = 4
+
+
+def noop_for(*types):
+    r"""Declare a converter returns its argument unchanged for some types.
+
+    Decorated functions skip a converter when called with arguments of these types, as well as a type validator that is known to pass for them::
+
+        @noop_for(list, tuple)
+        def to_list(x):
+            return x if isinstance(x, (list, tuple)) else list(x)
+
+    Parameters
+    ----------
+    \*types : type
+        Types of the arguments, including subclasses, the converter leaves unchanged.
+
+    Returns
+    -------
+    Function
+        A decorator returning the converter itself.
+
+    """
+
+    def decorator(converter):
+        setattr(converter, AUTOSIG_NOOP_FOR, types)
+        return converter
+
+    return decorator
+
+
+def is_noop(converter, t):
+    return issubclass(t, getattr(converter, AUTOSIG_NOOP_FOR, ()))
 
 
 def always_valid(x):
     return True
 
 
+@noop_for(object)
 def identity(x):
     return x
 
@@ -71,6 +141,8 @@ def param(
     docstring="",
     position=-1,
     kw_only=False,
+    trust=False,
+    strategy=None,
 ):
     """Define parameters in a signature class.
 
@@ -88,6 +160,10 @@ def param(
         Desired position of the param in the signature. Negative values start from the end.
     kw_only : bool
         Whether to make this parameter keyword-only.
+    trust : bool
+        Whether values that passed conversion and validation for this parameter are trusted in nested calls. While the body of a function is executing, the very same object passed again for this parameter, to any function, skips conversion and validation. Assumes the converter leaves converted values unchanged. See also ``set_trust``.
+    strategy : hypothesis strategy
+        A hypothesis strategy generating valid values for this parameter, see ``Signature.strategy``. Defaults to generating instances of the validator, if a type.
 
 
     Returns
@@ -96,14 +172,76 @@ def param(
         Object describing all the properties of the parameter. Can be reused in multiple signature definitions to enforce consistency.
 
     """
+    metadata = {
+        AUTOSIG_DOCSTRING: docstring,
+        AUTOSIG_POSITION: position,
+        AUTOSIG_TYPE: (
+            validator
+            if isinstance(validator, type)
+            else object
+            if validator is always_valid
+            else None
+        ),
+        AUTOSIG_TRUST: object() if trust else None,
+        AUTOSIG_STRATEGY: strategy,
+    }
     validator = check(validator, is_retval=False)
-    metadata = {AUTOSIG_DOCSTRING: docstring, AUTOSIG_POSITION: position}
+    if trust:
+        converter, validator = trusting(
+            metadata[AUTOSIG_TRUST], converter, validator
+        )
     kwargs = locals()
-    for key in ("docstring", "position"):
+    for key in ("docstring", "position", "trust", "strategy"):
         del kwargs[key]
     return attrib(**kwargs)
 
 
+# maps the trust token of each param to the value trusted for it in the
+# current call chain, replaced on entering and restored on leaving a body
+_trusted_values = (
+    ContextVar("autosig_trusted_values", default={}) if ContextVar else None
+)
+_trust_enabled = ContextVar is not None
+_untrusted = object()
+
+
+def set_trust(enabled):
+    """Enable or disable trusted values globally.
+
+    Disabling trust makes all params convert and validate every value, regardless of their trust argument, which can help debugging.
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether values of params defined with ``trust=True`` are trusted in nested calls.
+
+    Returns
+    -------
+    bool
+        The previous setting.
+
+    """
+    global _trust_enabled
+    assert not enabled or ContextVar is not None, "Trust requires python >= 3.7"
+    previous, _trust_enabled = _trust_enabled, enabled
+    return previous
+
+
+def trusting(token, converter, validator):
+    def is_trusted(x):
+        return _trust_enabled and _trusted_values.get().get(token, _untrusted) is x
+
+    @noop_for(*getattr(converter, AUTOSIG_NOOP_FOR, ()))
+    def trusting_converter(x):
+        return x if is_trusted(x) else converter(x)
+
+    def trusting_validator(instance, attribute, x):
+        if not is_trusted(x):
+            validator(instance, attribute, x)
+
+    return trusting_converter, trusting_validator
+
+
 @curry
 def keyfun(x, l):
     pos = x[1].metadata[AUTOSIG_POSITION]
@@ -141,6 +279,7 @@ class Signature:
         all_params = list(chain(iter(params), kwparams.items()))
         self._params = OrderedDict(sorted(all_params, key=keyfun(l=len(all_params))))
         self._late_init = identity
+        self._record_class = None
 
     def __add__(self, other):
         """Combine signatures.
@@ -156,9 +295,12 @@ class Signature:
         # must return compatible retvals to combine, or at most one of the two returns anything
         retval = self._retval if self._retval is not None else other._retval
         retval = [retval] if retval is not None else []
-        return Signature(
+        combined = Signature(
             *(chain(retval, self._params.items(), other._params.items()))
-        ).set_late_init(
+        )
+        if self._late_init is identity and other._late_init is identity:
+            return combined
+        return combined.set_late_init(
             lambda param_dict: (
                 self._late_init(param_dict),
                 other._late_init(param_dict),
@@ -184,6 +326,154 @@ class Signature:
         self._late_init = init
         return self
 
+    def validate(self, records):
+        """Convert and validate records against this signature.
+
+        Each record is treated like the arguments of a call to a function with this signature: converters, validators and the late init function are applied, but no function is called. Records are processed one at a time as they are consumed.
+
+        Parameters
+        ----------
+        records : Iterable
+            An iterable of mappings from parameter names to values.
+
+        Returns
+        -------
+        Iterator
+            An iterator over the converted records, as dictionaries, in input order. Raises an exception on the first invalid record, naming its index.
+
+        """
+        if self._record_class is None:
+            self._record_class = make_sig_class(self)
+        for i, record in enumerate(records):
+            yield validate_record(
+                self, self._record_class, record, "record {}".format(i)
+            )
+
+    def validate_jsonl(self, lines, processes=None, chunksize=1000):
+        """Convert and validate JSON-lines records against this signature.
+
+        Like ``validate``, for records serialized one per line as JSON objects. Blank lines are skipped. At most a fixed number of lines is read ahead of the consumer: one line when validating in the calling process, twice the number of processes times chunksize otherwise.
+
+        Parameters
+        ----------
+        lines : str or Iterable
+            The path of a JSON-lines file or an iterable of lines, such as an open file.
+        processes : int
+            Number of worker processes validating chunks of lines in parallel. The default, None, validates in the calling process. Requires the fork start method and converted values that can be pickled.
+        chunksize : int
+            Number of lines in each chunk sent to a worker process.
+
+        Returns
+        -------
+        Iterator
+            An iterator over the converted records, as dictionaries, in input order. Raises an exception on the first invalid record, naming its line number.
+
+        """
+        if isinstance(lines, str):
+            with open(lines) as stream:
+                yield from self.validate_jsonl(stream, processes, chunksize)
+            return
+        if self._record_class is None:
+            self._record_class = make_sig_class(self)
+        numbered_lines = enumerate(lines, 1)
+        if not processes:
+            yield from validate_lines(self, self._record_class, numbered_lines)
+            return
+        # workers are forked after registration and find the signature there,
+        # as neither it nor its class can be pickled in general
+        key = next(_record_validator_ids)
+        _record_validators[key] = (self, self._record_class)
+        pool = get_context("fork").Pool(processes)
+        try:
+            pending = deque()
+            for chunk in partition_all(chunksize, numbered_lines):
+                pending.append(pool.apply_async(validate_chunk, (key, chunk)))
+                if len(pending) > 2 * processes:
+                    yield from pending.popleft().get()
+            while pending:
+                yield from pending.popleft().get()
+        finally:
+            pool.terminate()
+            del _record_validators[key]
+
+    def strategy(self, valid=True):
+        """Generate arguments for functions with this signature.
+
+        Requires hypothesis, installed with the ``testing`` extra: ``pip install autosig[testing]``. Values for each parameter are drawn from the strategy passed to ``param``, if any, or else from instances of its validator, if a type, mixed with values of common builtin types when the parameter has a converter. Parameters with neither strategy nor type validator get values of common builtin types. Values are kept only if they pass conversion and validation for their parameter, while late init is not taken into account. Parameters with a default may be left out.
+
+        Parameters
+        ----------
+        valid : bool
+            Whether to generate valid arguments or arguments where the value for one parameter, with a validator other than the default, fails conversion or validation.
+
+        Returns
+        -------
+        Hypothesis strategy
+            A strategy generating dictionaries from parameter names to values, to be passed as keyword arguments.
+
+        """
+        try:
+            from hypothesis import strategies as st
+        except ImportError as e:
+            raise ImportError(HYPOTHESIS_MISSING) from e
+
+        if self._record_class is None:
+            self._record_class = make_sig_class(self)
+        fields = fields_dict(self._record_class)
+
+        def passes(attribute):
+            def predicate(x):
+                try:
+                    attribute.validator(None, attribute, attribute.converter(x))
+                except Exception:
+                    return False
+                return True
+
+            return predicate
+
+        any_values = st.one_of(
+            st.none(),
+            st.booleans(),
+            st.integers(),
+            st.floats(),
+            st.text(),
+            st.lists(st.integers()),
+            st.dictionaries(st.text(), st.integers()),
+        )
+
+        def values(attribute):
+            declared = attribute.metadata[AUTOSIG_TYPE]
+            strategy = attribute.metadata[AUTOSIG_STRATEGY]
+            if strategy is None and declared not in (None, object):
+                strategy = st.from_type(declared)
+            if strategy is None:
+                strategy = any_values
+            elif not is_noop(attribute.converter, object):
+                # converters may accept values the validator would not
+                strategy = strategy | any_values
+            return strategy.filter(passes(attribute))
+
+        mandatory = {}
+        optional = {}
+        for k, v in fields.items():
+            (optional if v.default is not NOTHING else mandatory)[k] = values(v)
+        valid_args = st.fixed_dictionaries(mandatory, optional=optional)
+        if valid:
+            return valid_args
+        candidates = [
+            k for k, v in fields.items() if v.metadata[AUTOSIG_TYPE] is not object
+        ]
+        assert candidates, "All params accept any value"
+
+        def invalidate(args_and_key):
+            args, k = args_and_key
+            valid_value = passes(fields[k])
+            return any_values.filter(lambda x: not valid_value(x)).map(
+                lambda x: dict(args, **{k: x})
+            )
+
+        return st.tuples(valid_args, st.sampled_from(candidates)).flatmap(invalidate)
+
     def __call__(self, f):
         """Decorate function f with signature.
 
@@ -208,11 +498,48 @@ def make_sig_class(sig):
         "Sig_" + str(abs(hash(sig))),
         attrs=sig._params,
         # bases=(SigBase, ),
+        slots=True,
         eq=False,
         order=False,
     )
 
 
+def validate_record(sig, Sig, record, location, parse=None):
+    try:
+        if parse is not None:
+            record = parse(record)
+        params = Sig(**record)
+        param_dict = asdict(params, recurse=False)
+        sig._late_init(param_dict)
+    except Exception as e:
+        message = "{}: {}".format(
+            location, re.sub(r"[\w.]*__init__", "record", str(e))
+        )
+        try:
+            located = type(e)(message)
+        except Exception:  # such as JSONDecodeError, a ValueError
+            located = ValueError(message)
+        raise located from e
+    return param_dict
+
+
+def validate_lines(sig, Sig, numbered_lines):
+    for number, line in numbered_lines:
+        if line.strip():
+            yield validate_record(
+                sig, Sig, line, "line {}".format(number), parse=json.loads
+            )
+
+
+_record_validators = {}
+_record_validator_ids = count()
+
+
+def validate_chunk(key, numbered_lines):
+    sig, Sig = _record_validators[key]
+    return list(validate_lines(sig, Sig, numbered_lines))
+
+
 def autosig(sig_or_f):
     """Decorate  functions or methods to attach signatures.
 
@@ -256,11 +583,7 @@ def autosig(sig_or_f):
             )
         )
     )
-    retval_sig = (
-        sig_or_f._retval
-        if argument_deco and sig_or_f._retval is not None
-        else lambda x: x
-    )
+    retval_sig = sig_or_f._retval if argument_deco else None
     retval_docstring = (
         sig_or_f._retval._docstring
         if argument_deco and sig_or_f._retval is not None
@@ -285,8 +608,106 @@ def autosig(sig_or_f):
                 ]
             )  # compared as OrderedDicts, retval ignored TODO: support retval?
 
-        @wraps(f)
-        def wrapped(*args, **kwargs):
+        fields = fields_dict(Sig)
+        f_parameters = list(signature(f).parameters.values())
+        has_self = bool(f_parameters) and f_parameters[0].name == "self"
+        if has_self:
+            f_parameters = f_parameters[1:]
+        f_signature = signature(f).replace(parameters=f_parameters)
+        # values are held in the order of the parameters of f, keyword-only
+        # ones last, which is also the order of Sig.__init__ unless positions
+        # or kw_only of params used without argument differ from it
+        names = [p.name for p in f_parameters]
+        Sig_parameters = signature(Sig).parameters.values()
+        binds_like_f = [(p.name, p.kind) for p in Sig_parameters] == [
+            (p.name, p.kind) for p in f_parameters
+        ]
+        # only keyword-only parameters are passed by keyword
+        kw_slots = [
+            (i, p.name)
+            for i, p in enumerate(f_parameters)
+            if p.kind == p.KEYWORD_ONLY
+        ]
+        n_positional = len(names) - len(kw_slots)
+        get_values = values_getter(names)
+        late_init = (
+            sig_or_f._late_init
+            if argument_deco and sig_or_f._late_init is not identity
+            else None
+        )
+        trust_tokens = [
+            (i, fields[k].metadata[AUTOSIG_TRUST])
+            for i, k in enumerate(names)
+            if fields[k].metadata[AUTOSIG_TRUST] is not None
+        ]
+
+        def split_self(args, kwargs):
+            if args:
+                return args[0], args[1:], kwargs
+            kwargs = dict(kwargs)
+            return kwargs.pop("self", NOTHING), args, kwargs
+
+        def bind_values(args, kwargs):
+            try:
+                if binds_like_f:
+                    return get_values(Sig(*args, **kwargs))
+                return get_values(Sig(**f_signature.bind(*args, **kwargs).arguments))
+            except TypeError as te:
+                # report mismatched arguments as inspect does, not as Sig
+                f_signature.bind(*args, **kwargs)
+                raise TypeError(re.sub("__init__", f.__qualname__, te.args[0]))
+
+        def bind(args, kwargs):
+            self_arg = NOTHING
+            if has_self:
+                self_arg, args, kwargs = split_self(args, kwargs)
+            return self_arg, bind_values(args, kwargs)
+
+        def invoke(self_arg, values, param_dict):
+            if param_dict is not None:
+                if self_arg is NOTHING:
+                    return f(**param_dict)
+                return f(self_arg, **param_dict)
+            if kw_slots:
+                kwargs = {}
+                for i, k in kw_slots:
+                    kwargs[k] = values[i]
+                if self_arg is NOTHING:
+                    return f(*values[:n_positional], **kwargs)
+                return f(self_arg, *values[:n_positional], **kwargs)
+            if self_arg is NOTHING:
+                return f(*values)
+            return f(self_arg, *values)
+
+        def call(self_arg, values):
+            # a dictionary is only needed by late init, which may modify it
+            param_dict = None
+            if late_init is not None:
+                param_dict = dict(zip(names, values))
+                late_init(param_dict)
+            if trust_tokens and _trust_enabled:
+                trusted = dict(_trusted_values.get())
+                # values replaced by late init have not been validated
+                trusted.update(
+                    (token, values[i])
+                    for i, token in trust_tokens
+                    if param_dict is None or param_dict[names[i]] is values[i]
+                )
+                reset_token = _trusted_values.set(trusted)
+                try:
+                    retval = invoke(self_arg, values, param_dict)
+                finally:
+                    _trusted_values.reset(reset_token)
+            else:
+                retval = invoke(self_arg, values, param_dict)
+            return retval if retval_sig is None else retval_sig(retval)
+
+        def call_bound(bound):
+            return call(*bound)
+
+        def reference(args, kwargs):
+            # the plain call path, sharing no code with the ones above, see
+            # autosig.testing
             try:
                 bound_args = signature(f).bind(*args, **kwargs).arguments
                 args_wo_self = bound_args.copy()
@@ -294,13 +715,58 @@ def autosig(sig_or_f):
                 params = Sig(**args_wo_self)
             except TypeError as te:
                 raise TypeError(re.sub("__init__", f.__qualname__, te.args[0]))
-            param_dict = params.__dict__
+            param_dict = asdict(params, recurse=False)
             if argument_deco:
                 sig_or_f._late_init(param_dict)
             if "self" in bound_args:
                 param_dict["self"] = bound_args["self"]
             retval = f(**param_dict)
-            return retval_sig(retval)
+            return retval if retval_sig is None else retval_sig(retval)
+
+        inline_cache = {}
+        counters = [0, 0]
+
+        @wraps(f)
+        def wrapped(*args, **kwargs):
+            self_arg = NOTHING
+            if has_self:
+                if not args:
+                    # self passed by keyword, too rare to specialize
+                    counters[1] += 1
+                    return call_bound(bind(args, kwargs))
+                self_arg = args[0]
+            # self, if any, is left in args and skipped by specialized paths
+            key = type_key(args, kwargs)
+            specialized = inline_cache.get(key)
+            if specialized:
+                return call(self_arg, specialized(args, kwargs))
+            counters[1] += 1
+            values = bind_values(args[1:] if has_self else args, kwargs)
+            if specialized is None and len(inline_cache) < INLINE_CACHE_SIZE:
+                specialized = inline_cache[key] = (
+                    specialize(args, kwargs, Sig, names, f.__qualname__, int(has_self))
+                    or False
+                )
+                counters[0] += bool(specialized)
+            return call(self_arg, values)
+
+        def specialization_info():
+            """Report on the call paths specialized for argument types.
+
+            Returns
+            -------
+            SpecializationInfo
+                Named tuple with the number of specializations created and of calls that could not use one.
+
+            """
+            return SpecializationInfo(*counters)
+
+        wrapped.specialization_info = specialization_info
+        # exposed separately for dispatchers that need to try a signature
+        # without executing the body, see Overload
+        setattr(wrapped, AUTOSIG_BIND, bind)
+        setattr(wrapped, AUTOSIG_CALL, call_bound)
+        setattr(wrapped, AUTOSIG_REFERENCE, reference)
 
         wrapped.__doc__ = (
             wrapped.__doc__
@@ -327,13 +793,375 @@ def autosig(sig_or_f):
     return decorator if argument_deco else decorator(sig_or_f)
 
 
+def type_key(args, kwargs):
+    key = tuple(map(type, args))
+    return key + tuple((k, type(v)) for k, v in kwargs.items()) if kwargs else key
+
+
+SpecializationInfo = namedtuple("SpecializationInfo", ["specializations", "misses"])
+
+# where a specialized call path finds the value of each parameter
+FROM_ARGS, FROM_KWARGS, FROM_DEFAULT, FROM_FACTORY = range(4)
+
+
+def values_getter(names):
+    if len(names) == 1:
+        name = names[0]
+        return lambda params: (getattr(params, name),)
+    return attrgetter(*names) if names else lambda params: ()
+
+
+def specialize(args, kwargs, Sig, names, qualname, skip):
+    """Build a call path for arguments of the same types as args and kwargs.
+
+    Binding positional and keyword arguments to parameters depends only on the number of the former and the names of the latter, which are fixed by the types of all of them. Converters declared no-ops for the type of their argument are skipped, and so are type validators if the argument type is known to pass.
+
+    Parameters
+    ----------
+    args : tuple
+        Positional arguments of a call that passed conversion and validation.
+    kwargs : dict
+        Keyword arguments of the same call.
+    Sig : type
+        The class generated from the signature.
+    names : list
+        Names of the parameters of Sig.__init__, in order.
+    qualname : str
+        Qualified name of the decorated function, for error messages.
+    skip : int
+        Number of leading positional arguments, such as self, not to bind.
+
+    Returns
+    -------
+    Function or None
+        A function taking args and kwargs of the same types and returning a list of converted and validated arguments, in the order of names. None if the signature can not be specialized.
+
+    """
+    sources = {
+        k: (FROM_ARGS, i) for i, k in enumerate(names[: len(args) - skip], skip)
+    }
+    sources.update((k, (FROM_KWARGS, k)) for k in kwargs)
+    slots = {k: i for i, k in enumerate(names)}
+    conversions = []
+    validations = []
+    for k, v in fields_dict(Sig).items():
+        if k in sources:
+            kind, source = sources[k]
+            t = type(args[source] if kind == FROM_ARGS else kwargs[source])
+            converter = None if is_noop(v.converter, t) else v.converter
+            declared = v.metadata[AUTOSIG_TYPE]
+            if converter is None and declared is not None and issubclass(t, declared):
+                validator = None
+            else:
+                validator = v.validator
+        elif isinstance(v.default, Factory):
+            if v.default.takes_self:
+                return None
+            kind, source = FROM_FACTORY, v.default.factory
+            converter, validator = v.converter, v.validator
+        else:
+            kind, source = FROM_DEFAULT, v.default
+            converter, validator = v.converter, v.validator
+        # in field order, as attrs converts and validates
+        conversions.append((slots[k], kind, source, converter))
+        if validator is not None:
+            validations.append((slots[k], v, validator))
+
+    def specialized(args, kwargs):
+        values = [None] * len(names)
+        try:
+            for i, kind, source, converter in conversions:
+                x = (
+                    args[source]
+                    if kind == FROM_ARGS
+                    else kwargs[source]
+                    if kind == FROM_KWARGS
+                    else source
+                    if kind == FROM_DEFAULT
+                    else source()
+                )
+                values[i] = x if converter is None else converter(x)
+        except TypeError as te:
+            raise TypeError(re.sub("__init__", qualname, te.args[0]))
+        for i, attribute, validator in validations:
+            validator(None, attribute, values[i])
+        return values
+
+    return specialized
+
+
+def accepted_type(attribute):
+    # values of other types may be accepted after conversion
+    declared = attribute.metadata[AUTOSIG_TYPE]
+    if declared is None or not is_noop(attribute.converter, object):
+        return object
+    return declared
+
+
+def admits(attribute, t):
+    # predicates and converters may reject some values of any type
+    declared = attribute.metadata[AUTOSIG_TYPE]
+    return (
+        declared is not None
+        and issubclass(t, declared)
+        and is_noop(attribute.converter, t)
+    )
+
+
+def may_accept(implementation, fields, args, kwargs):
+    """Whether an implementation may accept arguments of the types of args and kwargs.
+
+    Arguments are rejected by their types alone if they can not be bound to the parameters of the implementation, or if a parameter with a type validator and a converter that is a no-op for the type of its argument gets an argument of another type.
+
+    Parameters
+    ----------
+    implementation : Function
+        An autosig-decorated function.
+    fields : dict
+        The fields of its signature class, see ``make_sig_class``.
+    args : tuple
+        Positional arguments of a call.
+    kwargs : dict
+        Keyword arguments of the same call.
+
+    Returns
+    -------
+    bool
+        False if the implementation rejects any arguments of these types.
+
+    """
+    try:
+        arguments = signature(implementation).bind(*args, **kwargs).arguments
+    except TypeError:
+        return False
+    for k, x in arguments.items():
+        if k not in fields:  # self
+            continue
+        declared = fields[k].metadata[AUTOSIG_TYPE]
+        t = type(x)
+        if (
+            declared is not None
+            and is_noop(fields[k].converter, t)
+            and not issubclass(t, declared)
+        ):
+            return False
+    return True
+
+
+def shadows(earlier, later):
+    """Whether an implementation accepts some calls a later one accepts.
+
+    A call shape is the number of positional arguments and the names of the keyword arguments in a call. An implementation shadows a later one if for some call shape both accept it, mapping each argument to parameters of the former declared to accept all values the latter accepts, so that the later implementation can never be dispatched to for those calls. Parameters with a predicate validator, or with a converter not declared with ``noop_for``, are not known to accept any given value.
+
+    Parameters
+    ----------
+    earlier : dict
+        The fields of the signature class of the implementation registered first, see ``make_sig_class``.
+    later : dict
+        The fields of the signature class of the implementation registered later.
+
+    Returns
+    -------
+    bool
+        True if some calls to the later implementation would always be dispatched to the earlier one.
+
+    """
+    positional = [
+        [k for k, v in fields.items() if not v.kw_only] for fields in (earlier, later)
+    ]
+    for n in range(min(map(len, positional)) + 1):
+        pairs = list(zip(positional[0][:n], positional[1][:n]))
+        earlier_rest = earlier.keys() - set(positional[0][:n])
+        later_rest = later.keys() - set(positional[1][:n])
+        # all remaining mandatory parameters of either are passed by keyword
+        keywords = {k for k in earlier_rest if earlier[k].default is NOTHING}
+        keywords |= {k for k in later_rest if later[k].default is NOTHING}
+        if keywords <= earlier_rest & later_rest and all(
+            admits(earlier[e], accepted_type(later[l]))
+            for e, l in chain(pairs, zip(keywords, keywords))
+        ):
+            return True
+    return False
+
+
+class Overload:
+    """Group several signature and function pairs under one name.
+
+    Register implementations with the ``register`` decorator::
+
+        filter = Overload()
+
+        @filter.register(Signature(function=param(validator=callable),
+                                   iterable=param(validator=Iterable)))
+        def filter(function, iterable):
+            ...
+
+        @filter.register(Signature(iterable=param(validator=Iterable),
+                                   allowed=param(validator=set)))
+        def filter(iterable, allowed):
+            ...
+
+    A call is dispatched to the first registered implementation whose signature accepts the arguments, that is binds, converts and validates them without raising. For each combination of argument types, the implementations that could accept arguments of those types are found on the first call and cached in a table, so later calls with the same argument types only try those, still in registration order. Registering an implementation is an error if, for some calls, an already registered one is declared to accept all the arguments it accepts, as it could never be dispatched to for those calls. See ``shadows``.
+
+    Returns
+    -------
+    Overload
+        An empty overload, to be populated with ``register``.
+
+    """
+
+    def __init__(self):
+        """See class docs."""
+        self.__name__ = self.__qualname__ = None
+        self.__doc__ = ""
+        self._implementations = []
+        self._fields = []
+        self._dispatch_table = {}
+
+    def register(self, sig):
+        """Register an implementation with signature sig.
+
+        Parameters
+        ----------
+        sig : Signature
+            The signature of the implementation.
+
+        Returns
+        -------
+        Function
+            A decorator taking the implementation and returning this overload.
+
+        """
+
+        def decorator(f):
+            fields = fields_dict(make_sig_class(sig))
+            shadowing = [
+                implementation
+                for implementation, earlier in zip(self._implementations, self._fields)
+                if shadows(earlier, fields)
+            ]
+            assert not shadowing, "\n".join(
+                [
+                    "Ambiguous overload:",
+                    str(f),
+                    "is shadowed for some calls by",
+                    str(shadowing[0]),
+                ]
+            )
+            wrapped = sig(f)
+            self._implementations.append(wrapped)
+            self._fields.append(fields)
+            self._dispatch_table.clear()
+            if self.__name__ is None:
+                self.__name__ = f.__name__
+                self.__qualname__ = f.__qualname__
+            self.__doc__ = "\n\n".join(
+                [self.__doc__, wrapped.__doc__] if self.__doc__ else [wrapped.__doc__]
+            )
+            return self
+
+        return decorator
+
+    def __call__(self, *args, **kwargs):
+        """Dispatch a call to the matching implementation."""
+        key = type_key(args, kwargs)
+        candidates = self._dispatch_table.get(key)
+        if candidates is None:
+            candidates = self._dispatch_table[key] = [
+                implementation
+                for implementation, fields in zip(self._implementations, self._fields)
+                if may_accept(implementation, fields, args, kwargs)
+            ]
+        errors = []
+        for implementation in candidates:
+            try:
+                bound = getattr(implementation, AUTOSIG_BIND)(args, kwargs)
+            except Exception as e:
+                errors.append(e)
+                continue
+            return getattr(implementation, AUTOSIG_CALL)(bound)
+        # report why the implementations rejected by types alone do as well
+        for implementation in self._implementations:
+            if implementation not in candidates:
+                try:
+                    getattr(implementation, AUTOSIG_BIND)(args, kwargs)
+                except Exception as e:
+                    errors.append(e)
+        raise TypeError(
+            "\n".join(
+                [
+                    "No implementation of {name} accepts these arguments:".format(
+                        name=self.__qualname__
+                    )
+                ]
+                + ["  " + repr(e) for e in errors]
+            )
+        )
+
+    def __get__(self, instance, owner):
+        """Bind to instance when used as a method."""
+        return self if instance is None else partial(self, instance)
+
+
+def describe(type_or_predicate):
+    if isinstance(type_or_predicate, type):
+        return type_or_predicate
+    qualname = getattr(type_or_predicate, "__qualname__", None)
+    if qualname is None:
+        return repr(type_or_predicate)
+    if type_or_predicate.__name__ == "<lambda>":
+        return lambda_source(type_or_predicate)
+    return qualname
+
+
+def lambda_source(f):
+    # getsource returns the whole statement, or block, the lambda starts in
+    try:
+        source = getsource(f)
+    except OSError:  # defined interactively
+        return f.__qualname__
+    line = source.splitlines()[0]
+    starts = [m.start() for m in re.finditer(r"\blambda\b", line)]
+    if len(starts) > 1 and hasattr(f.__code__, "co_positions"):
+        # the lambda keyword is the last one before the code of its body
+        columns = [
+            column
+            for line_number, _, column, _ in f.__code__.co_positions()
+            # the resume instruction has column 0
+            if line_number == f.__code__.co_firstlineno and column
+        ]
+        starts = [start for start in starts if columns and start < min(columns)][-1:]
+    if len(starts) != 1:
+        return source
+    start = starts[0]
+    depth = 0
+    in_body = False
+    try:
+        for token in generate_tokens(StringIO(line[start:]).readline):
+            if token.type in (COMMENT, NEWLINE, ENDMARKER):
+                break
+            if token.type != OP:
+                continue
+            if token.string in "([{":
+                depth += 1
+            elif depth > 0 and token.string in ")]}":
+                depth -= 1
+            elif depth == 0 and token.string == ":":
+                in_body = True
+            elif depth == 0 and in_body and token.string in ")]},":
+                break
+    except TokenError:  # continued on the next line
+        return source
+    return line[start : start + token.start[1]].strip()
+
+
 def check(type_or_predicate, is_retval):
     """Transform a type or predicate into a autosig-friendly validator.
 
     Parameters
     ----------
     type_or_predicate : type or callable
-        A type or a single argument function returning a bool, indicating whether the check was passed. The function will be passed an argument value when check(function) is used as validator argument to param.
+        A type or a single argument function returning a bool, indicating whether the check was passed. The function will be passed an argument value when check(function) is used as validator argument to param. Combinations of predicates created with ``all_of`` or ``any_of`` name the one that failed.
 
     Returns
     -------
@@ -341,30 +1169,36 @@ def check(type_or_predicate, is_retval):
         A Callable to be used as validator argument to param.
 
     """
-    is_type = isinstance(type_or_predicate, type)
-    predicate = (
-        lambda x: isinstance(x, type_or_predicate) if is_type else type_or_predicate
-    )
 
-    def msg(name, value):
-        predicate_desc = (
-            type_or_predicate
-            if is_type
-            else (
-                type_or_predicate.__qualname__
-                if type_or_predicate.__qualname__ != "<lambda>"
-                else getsource(type_or_predicate)
-            )
-        )
+    def msg(name, value, failed=type_or_predicate):
+        is_type = isinstance(failed, type)
         m = (
             "type of {name} = {value} should be {predicate_desc}, {type} found instead"
             if is_type
             else "{name} = {value} should satisfy {predicate_desc}"
         )
         return m.format(
-            name=name, value=value, type=type(value), predicate_desc=predicate_desc
+            name=name, value=value, type=type(value), predicate_desc=describe(failed)
         )
 
+    if isinstance(type_or_predicate, Combinator):
+        failure = type_or_predicate.failure
+
+        def f_param(_, attribute=None, x=None):
+            failed = failure(x)
+            assert failed is None, msg(name=attribute.name, value=x, failed=failed)
+
+        def f_retval(x):
+            failed = failure(x)
+            assert failed is None, msg(name="return value", value=x, failed=failed)
+
+        return f_retval if is_retval else f_param
+
+    is_type = isinstance(type_or_predicate, type)
+    predicate = (
+        (lambda x: isinstance(x, type_or_predicate)) if is_type else type_or_predicate
+    )
+
     def f_param(_, attribute=None, x=None):
         assert predicate(x), msg(name=attribute.name, value=x)
 
@@ -372,3 +1206,190 @@ def check(type_or_predicate, is_retval):
         assert predicate(x), msg(name="return value", value=x)
 
     return f_retval if is_retval else f_param
+
+
+# number of evaluations of a combination of predicates between reorderings
+REORDER_INTERVAL = 1000
+# one evaluation in so many is timed, as timing costs more than most predicates
+SAMPLE_INTERVAL = 20
+
+
+class Combinator:
+    """Combine predicates, evaluating the cheapest and most decisive first.
+
+    Create with ``all_of`` or ``any_of``. Evaluation stops as soon as the result is known. Unless the order is fixed, the time taken by each predicate and how often it fails are recorded on one evaluation in SAMPLE_INTERVAL, and every REORDER_INTERVAL evaluations predicates are sorted by time per decisive outcome: failure for ``all_of``, success for ``any_of``. Predicates not yet evaluated go first. A predicate raising an exception counts as failed.
+
+    Parameters
+    ----------
+    predicates : list
+        Types, single argument functions returning a bool or other combinations.
+    require_all : bool
+        Whether all predicates have to hold, or any one of them.
+    fixed_order : bool
+        Whether to always evaluate predicates in the order given.
+
+    """
+
+    def __init__(self, predicates, require_all, fixed_order):
+        """See class docs."""
+        self._predicates = [
+            (lambda x, t=p: isinstance(x, t)) if isinstance(p, type) else p
+            for p in predicates
+        ]
+        self._described = predicates
+        self._require_all = require_all
+        self._fixed_order = fixed_order
+        self._order = list(range(len(predicates)))
+        self._ordered = list(self._predicates)
+        # timed evaluations, decisive outcomes and seconds spent, per predicate
+        self._stats = [[0, 0, 0.0] for _ in predicates]
+        self._samples = 0
+        # evaluations left until the next timed one
+        self._countdown = 1
+
+    def holds(self, i, x):
+        try:
+            return bool(self._predicates[i](x))
+        except Exception:
+            return False
+
+    def first_decisive(self, x):
+        """Evaluate predicates on x until the result is known.
+
+        Parameters
+        ----------
+        x : Any
+            The value to check.
+
+        Returns
+        -------
+        callable or None
+            The first predicate, in evaluation order, failing for ``all_of`` or holding for ``any_of``. None if there is none.
+
+        """
+        if not self._fixed_order:
+            self._countdown -= 1
+            if not self._countdown:
+                return self.timed_first_decisive(x)
+        p = None
+        try:
+            if self._require_all:
+                for p in self._ordered:
+                    if not p(x):
+                        return p
+            else:
+                for p in self._ordered:
+                    if p(x):
+                        return p
+        except Exception:
+            if self._require_all:
+                return p
+            # the predicate raising failed, go on with the following ones
+            rest = self._order[self._ordered.index(p) + 1 :]
+            return next((self._predicates[i] for i in rest if self.holds(i, x)), None)
+        return None
+
+    def timed_first_decisive(self, x):
+        self._countdown = SAMPLE_INTERVAL
+        decisive = not self._require_all
+        found = None
+        for i in self._order:
+            start = perf_counter()
+            outcome = self.holds(i, x)
+            stats = self._stats[i]
+            stats[2] += perf_counter() - start
+            stats[0] += 1
+            if outcome is decisive:
+                stats[1] += 1
+                found = self._predicates[i]
+                break
+        self._samples += 1
+        if self._samples * SAMPLE_INTERVAL % REORDER_INTERVAL == 0:
+            self._order = sorted(self._order, key=self.rank)
+            self._ordered = [self._predicates[i] for i in self._order]
+        return found
+
+    def failure(self, x):
+        """Evaluate predicates on x.
+
+        Parameters
+        ----------
+        x : Any
+            The value to check.
+
+        Returns
+        -------
+        type, callable or None
+            None if the combination holds, otherwise the predicate that failed for ``all_of``, looking into nested combinations, and the combination itself for ``any_of``.
+
+        """
+        found = self.first_decisive(x)
+        if not self._require_all:
+            return self if found is None else None
+        if found is None:
+            return None
+        failed = self._described[self._predicates.index(found)]
+        if isinstance(failed, Combinator):
+            # evaluated again, only when reporting the failure
+            return failed.failure(x) or failed
+        return failed
+
+    def rank(self, i):
+        evaluations, decisive, seconds = self._stats[i]
+        if evaluations == 0:
+            return 0.0
+        return seconds / decisive if decisive else float("inf")
+
+    def __call__(self, x):
+        """Whether the combination holds for x."""
+        found = self.first_decisive(x)
+        return found is None if self._require_all else found is not None
+
+    def __repr__(self):
+        """Describe the combination."""
+        return "{name}({predicates})".format(
+            name="all_of" if self._require_all else "any_of",
+            predicates=", ".join(str(describe(p)).strip() for p in self._described),
+        )
+
+
+def all_of(*predicates, fixed_order=False):
+    r"""Combine predicates into one holding when all of them hold.
+
+    Use as validator argument to param or Retval. When validation fails, the error message names the first predicate that failed. See ``Combinator`` for the evaluation order.
+
+    Parameters
+    ----------
+    \*predicates : type or callable
+        Types, single argument functions returning a bool or other combinations.
+    fixed_order : bool
+        Whether to always evaluate predicates in the order given, rather than adapting it to their cost and failure rate.
+
+    Returns
+    -------
+    Combinator
+        The combined predicate.
+
+    """
+    return Combinator(predicates, require_all=True, fixed_order=fixed_order)
+
+
+def any_of(*predicates, fixed_order=False):
+    r"""Combine predicates into one holding when any of them holds.
+
+    Use as validator argument to param or Retval. See ``Combinator`` for the evaluation order.
+
+    Parameters
+    ----------
+    \*predicates : type or callable
+        Types, single argument functions returning a bool or other combinations.
+    fixed_order : bool
+        Whether to always evaluate predicates in the order given, rather than adapting it to their cost and success rate.
+
+    Returns
+    -------
+    Combinator
+        The combined predicate.
+
+    """
+    return Combinator(predicates, require_all=False, fixed_order=fixed_order)
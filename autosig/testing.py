@@ -0,0 +1,105 @@
+"""Differential testing of the call paths of autosig-decorated functions.
+
+Requires hypothesis, installed with the ``testing`` extra: ``pip install autosig[testing]``.
+"""
+from .autosig import AUTOSIG_REFERENCE, HYPOTHESIS_MISSING
+
+try:
+    from hypothesis import given
+except ImportError as e:
+    raise ImportError(HYPOTHESIS_MISSING) from e
+from inspect import Parameter, signature
+
+__all__ = ["assert_same_outcome", "differential_test"]
+
+
+def outcome(f, args, kwargs):
+    try:
+        return "returned", f(*args, **kwargs)
+    except Exception as e:
+        return "raised", (type(e), e.args)
+
+
+def same(x, y):
+    try:
+        if x == y:
+            return True
+    except Exception:
+        pass
+    return repr(x) == repr(y)
+
+
+def assert_same_outcome(wrapped, args, kwargs):
+    """Assert all call paths of a decorated function agree on a call.
+
+    The reference path binds arguments with ``inspect.signature``, converts and validates them in full and passes them to the function by keyword, sharing no code with the optimized paths. It is compared with calling the decorated function twice, the first call possibly creating a specialized path for the types of the arguments and the second possibly using it. Values trusted in nested calls are only recorded on the optimized paths.
+
+    Parameters
+    ----------
+    wrapped : Function
+        An autosig-decorated function.
+    args : tuple
+        Positional arguments of the call.
+    kwargs : dict
+        Keyword arguments of the call.
+
+    Returns
+    -------
+    tuple
+        The outcome of the call, either ("returned", return value) or ("raised", (exception type, exception args)).
+
+    """
+    reference = outcome(
+        lambda *a, **k: getattr(wrapped, AUTOSIG_REFERENCE)(a, k), args, kwargs
+    )
+    for _ in range(2):
+        optimized = outcome(wrapped, args, kwargs)
+        assert optimized[0] == reference[0] and same(
+            optimized[1], reference[1]
+        ), "\n".join(
+            [
+                "Call paths disagree on " + wrapped.__qualname__,
+                "args: " + repr(args),
+                "kwargs: " + repr(kwargs),
+                "reference: " + repr(reference),
+                "optimized: " + repr(optimized),
+            ]
+        )
+    return reference
+
+
+def differential_test(sig, f, valid=True):
+    """Create a test comparing call paths on arguments generated from a signature.
+
+    Each generated set of arguments is passed both by keyword and, as far as the signature of f allows, by position. See ``assert_same_outcome``.
+
+    Parameters
+    ----------
+    sig : Signature
+        The signature generating the arguments, see ``Signature.strategy``.
+    f : Function
+        A function with signature sig, either not decorated or already decorated with autosig used without argument.
+    valid : bool
+        Whether to generate valid or invalid arguments.
+
+    Returns
+    -------
+    Function
+        A hypothesis test, to be called without arguments.
+
+    """
+    wrapped = f if hasattr(f, AUTOSIG_REFERENCE) else sig(f)
+    parameters = signature(wrapped).parameters.values()
+
+    @given(kwargs=sig.strategy(valid=valid))
+    def test(kwargs):
+        assert_same_outcome(wrapped, (), kwargs)
+        args = []
+        kwargs = dict(kwargs)
+        for p in parameters:
+            if p.name not in kwargs or p.kind != Parameter.POSITIONAL_OR_KEYWORD:
+                break
+            args.append(kwargs.pop(p.name))
+        assert_same_outcome(wrapped, tuple(args), kwargs)
+
+    return test
@@ -1,8 +1,21 @@
 """Tests for autosig."""
 from attr import asdict
-from autosig import Signature, autosig, param, Retval
+from autosig import (
+    Signature,
+    autosig,
+    param,
+    Retval,
+    Overload,
+    set_trust,
+    noop_for,
+    all_of,
+    any_of,
+)
+from autosig.autosig import INLINE_CACHE_SIZE, REORDER_INTERVAL
+from autosig.testing import assert_same_outcome, differential_test
 from autosig.autosig import make_sig_class
 from functools import partial
+import gc
 from hypothesis import (
     HealthCheck,
     assume,
@@ -10,14 +23,30 @@ from hypothesis import (
     # reproduce_failure,
     settings,
 )
-from hypothesis.strategies import builds, text, dictionaries
+from hypothesis.strategies import builds, data, integers, text, dictionaries
 from inspect import signature
+from io import StringIO
+from keyword import iskeyword
 from pytest import raises
 from string import ascii_letters, punctuation
+import sys
+import tracemalloc
+
+
+def identifiers():
+    """Generate identifiers.
+
+    Returns
+    -------
+    Hypothesis strategy
+        Strategy to generate identifiers, excluding reserved words.
+
+    """
+    return text(alphabet=ascii_letters, min_size=5, max_size=10).filter(
+        lambda x: not iskeyword(x)
+    )
+
 
-# hypothesis strategy for identifiers
-# min_size is 5 to avoid hitting reserved words by mistake
-identifiers = partial(text, alphabet=ascii_letters, min_size=5, max_size=10)
 docstrings = partial(
     text, alphabet=ascii_letters + punctuation + " \n", min_size=25, max_size=50
 )
@@ -137,6 +166,21 @@ def test_argumentless_decorator():
     ):
         fun(1.0)
 
+    # arguments bind to the parameters of fun, whatever the params say
+    for _ in range(2):
+        assert positioned(1, "x") == positioned(a=1, b="x") == (1, "x", 3)
+        assert positioned(1, "x", c=2.0) == (1, "x", 2)
+
+    @autosig
+    def fun(a=param(), *, b=param(default=3)):
+        return a, b
+
+    for _ in range(2):
+        assert fun(1, b=2) == (1, 2)
+        assert fun(1) == (1, 3)
+    with raises(TypeError):
+        fun(1, 2)
+
 
 def test_decorated_method():
     """Non-randomized test for method decorator."""
@@ -147,3 +191,500 @@ def test_decorated_method():
             return a
 
     assert C().method(1.1) == 1
+
+
+def test_overload():
+    """Non-randomized test for overloads."""
+    calls = []
+
+    def is_positive(x):
+        calls.append(x)
+        return x > 0
+
+    fun = Overload()
+
+    @fun.register(Signature(a=param(validator=int), b=param(validator=is_positive)))
+    def fun(a, b):
+        return "int"
+
+    @fun.register(Signature(a=param(validator=str)))
+    def fun(a):
+        return "str"
+
+    @fun.register(Signature(a=param(validator=int), b=param(validator=int)))
+    def fun(a, b):
+        return "any int"
+
+    assert fun(1, 1) == "int"
+    assert fun("a") == "str"
+    assert fun(1, -1) == "any int"
+    # cached by argument types, the first implementation is tried first
+    del calls[:]
+    assert fun(2, 1) == "int"
+    assert calls == [1]
+    with raises(TypeError, match="No implementation of .*fun accepts"):
+        fun(1.0)
+
+    with raises(AssertionError, match="Ambiguous overload"):
+
+        @fun.register(Signature(x=param(validator=str)))
+        def fun(x):
+            pass
+
+    # predicates can tell implementations apart
+    sign = Overload()
+
+    @sign.register(Signature(x=param(validator=lambda x: x > 0)))
+    def sign(x):
+        return 1
+
+    @sign.register(Signature(x=param(validator=lambda x: x < 0)))
+    def sign(x):
+        return -1
+
+    assert sign(2) == 1 and sign(-2) == -1
+
+    # the outcome does not depend on earlier calls
+    positive = Overload()
+
+    @positive.register(Signature(x=param(validator=lambda x: x > 0)))
+    def positive(x):
+        return "positive"
+
+    @positive.register(Signature(x=param(validator=int)))
+    def positive(x):
+        return "int"
+
+    assert positive(-1) == "int"
+    assert positive(1) == "positive"
+    with raises(TypeError, match="No implementation of .*positive accepts"):
+        positive({"k": 1})
+
+    def one(a):
+        pass
+
+    def two(a, b=0):
+        pass
+
+    # an earlier implementation accepts all ints for some calls
+    for earlier, later in [
+        ((Signature(a=param()), one), (Signature(a=param(validator=int)), one)),
+        (
+            (Signature(a=param(validator=int)), one),
+            (Signature(a=param(validator=int), b=param(default=0)), two),
+        ),
+        (
+            (Signature(a=param(validator=int), b=param(default=0)), two),
+            (Signature(a=param(validator=int)), one),
+        ),
+    ]:
+        overload = Overload()
+        overload.register(earlier[0])(earlier[1])
+        with raises(AssertionError, match="Ambiguous overload"):
+            overload.register(later[0])(later[1])
+
+    # converters may reject values of the declared type
+    overload = Overload()
+    overload.register(Signature(a=param(converter=int, validator=int)))(one)
+    overload.register(Signature(a=param(validator=int)))(one)
+
+
+def test_validate_records():
+    """Non-randomized test for record validation."""
+
+    def late_init(param_dict):
+        param_dict["total"] = param_dict["a"] + param_dict["b"]
+
+    sig = Signature(
+        a=param(converter=int, validator=int),
+        b=param(default=0, validator=lambda x: x >= 0),
+        total=param(default=None),
+    ).set_late_init(late_init)
+    records = [{"a": "1"}, {"a": 2, "b": 3}]
+    assert list(sig.validate(records)) == [
+        dict(a=1, b=0, total=1),
+        dict(a=2, b=3, total=5),
+    ]
+    with raises(AssertionError, match="record 1: b = -1"):
+        list(sig.validate([{"a": 1}, {"a": 1, "b": -1}]))
+    with raises(TypeError, match="record 0: record\\(\\) got"):
+        list(sig.validate([{"c": 1}]))
+    lines = "".join('{"a": %d, "b": %d}\n\n' % (i, i) for i in range(100))
+    expected = [dict(a=i, b=i, total=2 * i) for i in range(100)]
+    assert list(sig.validate_jsonl(StringIO(lines))) == expected
+    assert (
+        list(sig.validate_jsonl(StringIO(lines), processes=2, chunksize=7)) == expected
+    )
+    # blank lines count, the first line is 1
+    lines += '{"a": 1, "b": -1}\n'
+    for processes in [None, 2]:
+        with raises(AssertionError, match="line 201: b = -1"):
+            list(sig.validate_jsonl(StringIO(lines), processes=processes, chunksize=7))
+        # converter errors and malformed lines
+        for line, error in [('{"a": "x"}', ValueError), ('{"a": ', ValueError)]:
+            with raises(error, match="line 2: "):
+                list(sig.validate_jsonl(StringIO("\n" + line), processes=processes))
+
+
+def test_trust():
+    """Non-randomized test for trusted values."""
+    calls = []
+
+    def to_list(x):
+        calls.append(x)
+        return list(x)
+
+    sig = Signature(a=param(converter=to_list, validator=list, trust=True))
+
+    @sig
+    def inner(a):
+        return a
+
+    @sig
+    def outer(a):
+        return inner(a), inner(list(a))
+
+    outer((1, 2))
+    # the second inner call gets a new object, not trusted
+    assert len(calls) == 2
+    del calls[:]
+    inner([1])
+    assert len(calls) == 1
+    del calls[:]
+    previous = set_trust(False)
+    try:
+        outer((1, 2))
+    finally:
+        set_trust(previous)
+    assert len(calls) == 3
+
+
+def test_specialization():
+    """Non-randomized test for specialized call paths."""
+    calls = []
+
+    @noop_for(list)
+    def to_list(x):
+        calls.append(x)
+        return x if isinstance(x, list) else list(x)
+
+    @autosig
+    def fun(a=param(converter=to_list, validator=list), b=param(default=1)):
+        return a, b
+
+    assert fun([1]) == ([1], 1)
+    assert fun.specialization_info() == (1, 1)
+    assert fun([2], b=2) == ([2], 2)
+    assert fun((3,)) == ([3], 1)
+    assert fun.specialization_info() == (3, 3)
+    del calls[:]
+    assert fun([4]) == ([4], 1)
+    assert fun((5,)) == ([5], 1)
+    # the converter runs only where it is not a no-op
+    assert calls == [(5,)]
+    assert fun.specialization_info() == (3, 3)
+    # beyond the cache size, calls take the general path
+    for x in [1.0, "a", None]:
+        assert fun([], x) == ([], x)
+    assert fun.specialization_info() == (INLINE_CACHE_SIZE, 6)
+
+
+# params in an order and of kinds other than their positions and kw_only
+positioned_sig = Signature(
+    a=param(validator=int, position=1),
+    b=param(validator=str, position=0),
+    c=param(default=3, converter=int),
+)
+
+
+@autosig
+def positioned(
+    a=positioned_sig._params["a"],
+    b=positioned_sig._params["b"],
+    *,
+    c=positioned_sig._params["c"],
+):
+    return a, b, c
+
+
+@given(sig=signatures(), data=data())
+def test_call_paths(sig, data):
+    """Call paths agree on arguments generated from a signature."""
+    Sig = make_sig_class(sig)
+    f = sig(Sig)
+    for _ in range(2):
+        assert_same_outcome(f, (), data.draw(sig.strategy()))
+    kwargs = data.draw(positioned_sig.strategy())
+    assert_same_outcome(positioned, (), kwargs)
+    assert_same_outcome(positioned, (kwargs.pop("a"), kwargs.pop("b")), kwargs)
+
+
+def test_differential():
+    """Non-randomized test for differential testing of call paths."""
+
+    @noop_for(list)
+    def to_list(x):
+        return x if isinstance(x, list) else list(x)
+
+    b = param(converter=to_list, validator=list, trust=True)
+    sig = Signature(
+        a=param(validator=int),
+        b=b,
+        c=param(default=1.0, converter=float, validator=lambda x: x >= 0),
+        d=param(default="", validator=str, kw_only=True),
+        e=param(default=None, strategy=integers(min_value=0)),
+    )
+
+    def fun(a, b, c=1.0, e=None, *, d=""):
+        return a, b, c, d, e
+
+    differential_test(sig, fun)()
+    differential_test(sig, fun, valid=False)()
+
+    @Signature(b=b)
+    def inner(b):
+        return b
+
+    # the reference path does not trust b in the nested call
+    def outer(a, b, c=1.0, e=None, *, d=""):
+        return inner(b) is b, inner(b=list(b)), a, c, d, e
+
+    differential_test(sig, outer)()
+    differential_test(positioned_sig, positioned)()
+    differential_test(positioned_sig, positioned, valid=False)()
+
+
+def test_combinators():
+    """Non-randomized test for combinations of predicates."""
+
+    def not_empty(x):
+        return len(x) > 0
+
+    def is_lower(x):
+        return x.islower()
+
+    @autosig
+    def fun(a=param(validator=all_of(str, not_empty, is_lower))):
+        return a
+
+    assert fun("a") == "a"
+    with raises(AssertionError, match="a =  should satisfy .*not_empty"):
+        fun("")
+    with raises(AssertionError, match="type of a = 1 should be <class 'str'>"):
+        fun(1)
+
+    def raises_on_int(x):
+        return len(x) > 0
+
+    # predicates raising count as failed, whether timed or not
+    either, both = any_of(raises_on_int, int), all_of(int, raises_on_int)
+    for _ in range(2):
+        assert either(0) and not both(0)
+
+    @autosig
+    def fun(a=param(validator=any_of(int, not_empty))):
+        return a
+
+    assert fun(0) == 0
+    with raises(AssertionError, match=r"satisfy any_of\(<class 'int'>, .*not_empty"):
+        fun("")
+
+    @autosig
+    def fun(a=param(validator=all_of(int, all_of(lambda x: x > 0, lambda x: x < 9)))):
+        return a
+
+    below_nine = lambda x: x < 9  # noqa: E731, a comment left out
+
+    @autosig
+    def small(a=param(validator=below_nine)):
+        return a
+
+    with raises(AssertionError, match=r"satisfy lambda x: x < 9$"):
+        small(10)
+
+    # nested combinations name the predicate that failed, lambdas by their source
+    with raises(AssertionError, match=r"a = 10 should satisfy lambda x: x < 9$"):
+        fun(10)
+
+    @autosig
+    def fun(a=param(validator=all_of(int, any_of(lambda x: x > 10, not_empty)))):
+        return a
+
+    with raises(
+        AssertionError,
+        match=r"a = 1 should satisfy any_of\(lambda x: x > 10, .*not_empty\)$",
+    ):
+        fun(1)
+
+    def expensive(x):
+        return sum(range(100)) > 0
+
+    def cheap(x):
+        return x % 3 == 0
+
+    adaptive = all_of(expensive, cheap)
+    fixed = all_of(expensive, cheap, fixed_order=True)
+    # only some evaluations are timed, which must not all pass
+    for i in range(REORDER_INTERVAL):
+        assert adaptive(i) == fixed(i) == (i % 3 == 0)
+    # the only predicate ever failing goes first
+    assert adaptive._order == [1, 0]
+    assert fixed._order == [0, 1]
+
+
+def test_allocations():
+    """Calls with valid arguments leave no allocations behind in autosig."""
+
+    @noop_for(list)
+    def to_list(x):
+        return x if isinstance(x, list) else list(x)
+
+    def make_sig():
+        return Signature(
+            a=param(validator=int),
+            b=param(default=(), converter=to_list, validator=list, trust=True),
+            # reordering replaces a list now and then, not on every call
+            c=param(
+                default="c", validator=all_of(str, len, fixed_order=True), kw_only=True
+            ),
+        )
+
+    sig = make_sig()
+
+    @sig
+    def fun(a, b=(), *, c="c"):
+        return a
+
+    @sig
+    def nested(a, b=(), *, c="c"):
+        return fun(a, b, c=c)
+
+    @make_sig().set_late_init(lambda param_dict: None)
+    def late(a, b=(), *, c="c"):
+        return a
+
+    class C:
+        @Signature(a=param(converter=int))
+        def method(self, a):
+            return a
+
+    calls = [
+        (fun, (1,), {}),
+        (fun, (1, [1]), {"c": "c"}),
+        (fun, (), {"a": 1, "b": (1,)}),
+        (nested, (1, [1]), {}),
+        (late, (1,), {"c": "c"}),
+        (C().method, (1.0,), {}),
+        (C.method, (C(), 1.0), {}),
+        (positioned, (1, "x"), {"c": 2}),
+        (positioned, (), {"b": "x", "a": 1}),
+    ]
+    # free lists recycle memory across call sites, trace all code involved
+    filters = [
+        tracemalloc.Filter(True, sys.modules["autosig.autosig"].__file__),
+        tracemalloc.Filter(True, __file__),
+    ]
+
+    def run(f, args, kwargs):
+        for _ in range(1000):
+            f(*args, **kwargs)
+        # no garbage for the cycle collector either
+        assert gc.collect() == 0
+        return tracemalloc.take_snapshot().filter_traces(filters)
+
+    for f, args, kwargs in calls:
+        # fill caches and let counters grow past small cached ints
+        for _ in range(1000):
+            f(*args, **kwargs)
+        gc.collect()
+        gc.disable()
+        tracemalloc.start()
+        try:
+            # compare two traced runs, as values replaced in the first one
+            # were allocated before tracing; collecting also empties free lists
+            first = run(f, args, kwargs)
+            second = run(f, args, kwargs)
+        finally:
+            tracemalloc.stop()
+            gc.enable()
+        stats = second.compare_to(first, "lineno")
+        assert sum(stat.size_diff for stat in stats) == 0
+
+
+def test_allocations_per_call():
+    """Calls hold two dictionaries of parameters fewer than the reference path."""
+    snapshots = []
+
+    def hold():
+        if tracemalloc.is_tracing():
+            snapshots.append(tracemalloc.take_snapshot())
+
+    sig = Signature(
+        a=param(validator=int),
+        b=param(default=(), converter=list, validator=list, trust=True),
+        c=param(default="c", validator=str),
+    )
+
+    @sig
+    def fun(a, b=(), c="c"):
+        hold()
+
+    @Signature(a=param(validator=int), c=param(default="c", kw_only=True))
+    def keyword_only(a, *, c="c"):
+        hold()
+
+    @Signature(a=param(validator=int)).set_late_init(lambda param_dict: None)
+    def late(a):
+        hold()
+
+    class C:
+        @Signature(a=param(converter=int))
+        def method(self, a):
+            hold()
+
+    calls = [
+        (fun, (1, [1]), {}, 3),
+        (fun, (), {"a": 1, "c": "d"}, 3),
+        (keyword_only, (1,), {"c": "d"}, 2),
+        (late, (1,), {}, 1),
+        (C.method, (C(), 1.0), {}, 1),
+    ]
+    # whatever the call machinery allocates on behalf of this file
+    filters = [
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ]
+
+    def held(f, args, kwargs):
+        for _ in range(10):
+            f(*args, **kwargs)
+        sizes = []
+        for _ in range(3):
+            gc.collect()
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot().filter_traces(filters)
+            try:
+                f(*args, **kwargs)
+            finally:
+                tracemalloc.stop()
+            # allocated by the call and still alive in the body
+            during = snapshots.pop().filter_traces(filters)
+            sizes.append(
+                sum(stat.size_diff for stat in during.compare_to(before, "filename"))
+            )
+        return min(sizes)
+
+    reference = sys.modules["autosig.autosig"].AUTOSIG_REFERENCE
+    # trusted values are only recorded on the optimized path
+    previous = set_trust(False)
+    try:
+        for f, args, kwargs, n in calls:
+            optimized = held(f, args, kwargs)
+            plain = held(lambda *a, **k: getattr(f, reference)(a, k), args, kwargs)
+            # the reference path, as earlier versions, holds the parameters in
+            # BoundArguments, a copy of them and a dictionary made from the
+            # holder, the optimized one at most in a dictionary the call needs
+            copies = 2 * sys.getsizeof(dict.fromkeys(map(str, range(n))))
+            assert optimized + copies <= plain, (f, optimized, plain)
+    finally:
+        set_trust(previous)